@@ -8,7 +8,7 @@ with accurate timing. The GUI enables visualization, editing, saving, and loadin
 
 Main Features:
 - Global recording via pynput listeners
-- PyQt5 GUI with editable table of events
+- PyQt5 GUI with a model-backed table of events
 - Adjustable playback speed and repeat count
 - Customizable hotkeys with persistent storage
 - Protection against recursion loops during playback
@@ -18,13 +18,28 @@ Author: Destroyer 🦾
 
 
 from PyQt5 import QtWidgets, QtCore
-from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtCore import pyqtSignal, Qt, QAbstractTableModel, QModelIndex
 from pynput import mouse, keyboard
 from pynput.keyboard import GlobalHotKeys
+import numpy as np
 import sys
 import json
 import time
 import threading
+import collections
+import itertools
+import ctypes
+from ctypes import wintypes
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 key_mapping = {
     'Key.enter': keyboard.Key.enter,
@@ -43,6 +58,308 @@ key_mapping = {
     'Key.backspace': keyboard.Key.backspace
 }
 
+# Special keys by their bare recorded name ('enter' -> Key.enter).
+# Anything not found here is a character and is replayed as-is.
+KEY_LOOKUP = {name.split('.')[-1]: key for name, key in key_mapping.items()}
+
+_KeyCode = keyboard.KeyCode
+
+# read_json() / write_json(): Macro JSON I/O, using orjson when it is installed
+# and falling back to the standard json module otherwise.
+def read_json(path):
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r") as f:
+        return json.load(f)
+
+def write_json(path, data):
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+# douglas_peucker(): Returns a keep-mask for an (n, 2) point array, keeping the
+# endpoints and every point that deviates more than epsilon from the line
+# between the points kept around it.
+def douglas_peucker(points, epsilon):
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        seg = points[end] - points[start]
+        inner = points[start + 1:end] - points[start]
+        length = np.hypot(seg[0], seg[1])
+        if length == 0:
+            dists = np.hypot(inner[:, 0], inner[:, 1])
+        else:
+            dists = np.abs(seg[0] * inner[:, 1] - seg[1] * inner[:, 0]) / length
+        index = int(np.argmax(dists))
+        if dists[index] > epsilon:
+            split = start + 1 + index
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return keep
+
+ACTION_COLUMNS = ["type", "action", "x", "y", "extra", "delay_ms"]
+ACTION_HEADERS = ["Type", "Action", "X", "Y", "Extra", "Delay (ms)"]
+
+TYPE_NAMES = ["Mouse", "Key"]
+T_MOUSE, T_KEY = 0, 1
+A_MOVE, A_CLICK, A_SCROLL = 0, 1, 2
+
+
+
+# =========================================================
+# ActionBuffer: Recorded events stored as parallel NumPy columns.
+# Type and action are small integer codes; action, key and mouse
+# button names are kept once in a shared vocabulary list.
+# The extra column holds the button's vocab index for clicks,
+# the wheel delta for scrolls and the is_special flag for keys.
+# Coordinates are int16 and delays are integer milliseconds.
+# =========================================================
+class ActionBuffer:
+    INITIAL_CAPACITY = 4096
+    COLUMNS = ("_types", "_actions", "_xs", "_ys", "_extras", "_delays")
+
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        self._n = 0
+        self._types = np.zeros(capacity, dtype=np.uint8)
+        self._actions = np.zeros(capacity, dtype=np.int32)
+        self._xs = np.zeros(capacity, dtype=np.int16)
+        self._ys = np.zeros(capacity, dtype=np.int16)
+        self._extras = np.zeros(capacity, dtype=np.int32)
+        self._delays = np.zeros(capacity, dtype=np.uint32)
+        self._action_vocab = ["Move", "Click", "Scroll"]
+        self._vocab_index = {name: i for i, name in enumerate(self._action_vocab)}
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def vocab(self):
+        return self._action_vocab
+
+    def _intern(self, name):
+        index = self._vocab_index.get(name)
+        if index is None:
+            index = len(self._action_vocab)
+            self._action_vocab.append(name)
+            self._vocab_index[name] = index
+        return index
+
+    def _reserve(self, size):
+        capacity = len(self._types)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity = max(capacity * 2, self.INITIAL_CAPACITY)
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self._n] = column[:self._n]
+            setattr(self, name, grown)
+
+    # extend_records(): Appends (type, action, x, y, extra, delay_ms) tuples.
+    # Mouse actions arrive as A_* codes; key names and click buttons as
+    # strings, which are interned here.
+    def extend_records(self, records):
+        start = self._n
+        self._reserve(start + len(records))
+        intern = self._intern
+        rows = []
+        for type_code, action, x, y, extra, delay_ms in records:
+            if type_code == T_KEY:
+                action = intern(action)
+                extra = 1 if extra else 0
+            elif action == A_CLICK:
+                extra = intern(extra)
+            rows.append((type_code, action, x, y, extra, delay_ms))
+        end = start + len(rows)
+        for name, values in zip(self.COLUMNS, zip(*rows)):
+            getattr(self, name)[start:end] = values
+        self._n = end
+
+    # extend(): Appends event dicts in the JSON macro format.
+    def extend(self, events):
+        records = []
+        for event in events:
+            if 'delay_ms' in event:
+                delay_ms = event['delay_ms']
+            else:
+                # Legacy delays came from time.time() and can be negative
+                # after a clock step; clamp them like current_delay() does.
+                delay_ms = max(0, round(event.get('delay', 0.0) * 1000))
+            if event['type'] == 'Key':
+                records.append((T_KEY, event['action'], 0, 0, event.get('is_special', False), delay_ms))
+            else:
+                action = self._intern(event['action'])
+                records.append((T_MOUSE, action, event['x'], event['y'], event.get('extra', 0), delay_ms))
+        self.extend_records(records)
+
+    def cell(self, row, column):
+        type_code = self._types[row]
+        if column == 0:
+            return TYPE_NAMES[type_code]
+        if column == 1:
+            return self._action_vocab[self._actions[row]]
+        if column == 5:
+            return int(self._delays[row])
+        if type_code == T_KEY:
+            return ''
+        if column == 2:
+            return int(self._xs[row])
+        if column == 3:
+            return int(self._ys[row])
+        action = self._actions[row]
+        if action == A_CLICK:
+            return self._action_vocab[self._extras[row]]
+        if action == A_SCROLL:
+            return int(self._extras[row])
+        return ''
+
+    # simplified(): Returns a copy with each run of consecutive moves reduced
+    # by Douglas-Peucker. Every kept event still fires at its original time:
+    # the delays of dropped moves are folded into the next kept event.
+    def simplified(self, epsilon=1.0):
+        n = self._n
+        keep = np.ones(n, dtype=bool)
+        is_move = (self._types[:n] == T_MOUSE) & (self._actions[:n] == A_MOVE)
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], is_move.view(np.int8), [0]))))
+        points = np.column_stack((self._xs[:n], self._ys[:n])).astype(np.float64)
+        for start, end in zip(edges[0::2], edges[1::2]):
+            if end - start > 2:
+                keep[start:end] = douglas_peucker(points[start:end], epsilon)
+
+        buffer = ActionBuffer(0)
+        for name in self.COLUMNS:
+            setattr(buffer, name, getattr(self, name)[:n][keep])
+        times = np.cumsum(self._delays[:n], dtype=np.int64)[keep]
+        buffer._delays = np.diff(times, prepend=0).astype(np.uint32)
+        buffer._action_vocab = list(self._action_vocab)
+        buffer._vocab_index = dict(self._vocab_index)
+        buffer._n = len(buffer._types)
+        return buffer
+
+    def to_lists(self, start=0, stop=None):
+        stop = self._n if stop is None else min(stop, self._n)
+        return tuple(getattr(self, name)[start:stop].tolist() for name in self.COLUMNS)
+
+    # to_events(): Expands the columns back into the JSON event dicts.
+    def to_events(self):
+        vocab = self._action_vocab
+        events = []
+        for type_code, action, x, y, extra, delay in zip(*self.to_lists()):
+            event = {'type': TYPE_NAMES[type_code], 'action': vocab[action]}
+            if type_code == T_KEY:
+                event['is_special'] = bool(extra)
+            else:
+                event['x'] = x
+                event['y'] = y
+                if action == A_CLICK:
+                    event['extra'] = vocab[extra]
+                elif action == A_SCROLL:
+                    event['extra'] = extra
+            event['delay_ms'] = delay
+            events.append(event)
+        return events
+
+    @classmethod
+    def from_events(cls, events):
+        buffer = cls(max(len(events), cls.INITIAL_CAPACITY))
+        buffer.extend(events)
+        return buffer
+
+    def save_npz(self, path):
+        n = self._n
+        np.savez_compressed(
+            path,
+            vocab=np.array(self._action_vocab),
+            **{name.lstrip('_'): getattr(self, name)[:n] for name in self.COLUMNS}
+        )
+
+    # load_npz(): Adopts the decompressed columns as-is, without copying them
+    # into a preallocated buffer; they are only regrown if events are added.
+    @classmethod
+    def load_npz(cls, path):
+        buffer = cls(0)
+        with np.load(path) as data:
+            for name in cls.COLUMNS:
+                column = getattr(buffer, name)
+                setattr(buffer, name, data[name.lstrip('_')].astype(column.dtype, copy=False))
+            buffer._action_vocab = data['vocab'].tolist()
+        buffer._vocab_index = {name: i for i, name in enumerate(buffer._action_vocab)}
+        buffer._n = len(buffer._types)
+        return buffer
+
+    # load_json(): Loads a JSON macro. With ijson installed the file is
+    # streamed into the columns a chunk at a time instead of being parsed
+    # into one big list of dicts first.
+    @classmethod
+    def load_json(cls, path):
+        if ijson is None:
+            return cls.from_events(read_json(path))
+        buffer = cls()
+        with open(path, "rb") as f:
+            events = ijson.items(f, 'item', use_float=True)
+            while True:
+                chunk = list(itertools.islice(events, cls.INITIAL_CAPACITY))
+                if not chunk:
+                    break
+                buffer.extend(chunk)
+        return buffer
+
+
+
+# =========================================================
+# ActionModel: Table model that reads straight from the ActionBuffer.
+# The view only asks for the rows it is showing, so no per-cell
+# widgets are ever created for recorded or loaded events.
+# =========================================================
+class ActionModel(QAbstractTableModel):
+    def __init__(self, actions, parent=None):
+        super().__init__(parent)
+        self.actions = actions
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.actions)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(ACTION_COLUMNS)
+
+    # data(): Numbers are handed to Qt as ints and formatted by the view's
+    # delegate only when a cell is painted; names are already strings.
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        return self.actions.cell(index.row(), index.column())
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return ACTION_HEADERS[section]
+        return str(section + 1)
+
+    def extend_actions(self, records):
+        if not records:
+            return
+        first = len(self.actions)
+        self.beginInsertRows(QModelIndex(), first, first + len(records) - 1)
+        self.actions.extend_records(records)
+        self.endInsertRows()
+
+    def set_actions(self, actions):
+        self.beginResetModel()
+        self.actions = actions
+        self.endResetModel()
+
 
 
 # =========================================================
@@ -77,34 +394,140 @@ class SettingsDialog(QtWidgets.QDialog):
 
 
 
+# =========================================================
+# NativeHotKeys: Windows replacement for pynput's GlobalHotKeys.
+# Registers the combinations with RegisterHotKey and runs a message
+# pump in its own thread, so the OS only wakes us for those exact
+# combinations instead of running a Python hook on every keystroke.
+# Takes the same '<ctrl>+<f1>' style mapping and start()/stop() calls.
+# Combinations listed in on_demand start unregistered and are toggled
+# with set_enabled(), since a registered hotkey is swallowed system-wide.
+# The pump tracks which ids it holds, so repeated toggles are no-ops.
+# =========================================================
+class NativeHotKeys(threading.Thread):
+    WM_QUIT = 0x0012
+    WM_HOTKEY = 0x0312
+    WM_ENABLE_HOTKEY = 0x8000 + 1
+    WM_DISABLE_HOTKEY = 0x8000 + 2
+    MOD_NOREPEAT = 0x4000
+    MODIFIERS = {'<alt>': 0x0001, '<ctrl>': 0x0002, '<shift>': 0x0004}
+    VIRTUAL_KEYS = {'<esc>': 0x1B, **{f'<f{n}>': 0x6F + n for n in range(1, 25)}}
+
+    def __init__(self, hotkeys, on_demand=()):
+        super().__init__(daemon=True)
+        self._combos = list(hotkeys)
+        self._callbacks = list(hotkeys.values())
+        self._keys = [self._parse(combo) for combo in self._combos]
+        self._on_demand = set(on_demand)
+        self._registered = set()
+        self._thread_id = None
+        self._ready = threading.Event()
+
+    @classmethod
+    def _parse(cls, combo):
+        modifiers, vk = cls.MOD_NOREPEAT, None
+        for part in combo.split('+'):
+            if part in cls.MODIFIERS:
+                modifiers |= cls.MODIFIERS[part]
+            else:
+                vk = cls.VIRTUAL_KEYS[part]
+        return modifiers, vk
+
+    def _register(self, hotkey_id):
+        if hotkey_id in self._registered:
+            return
+        modifiers, vk = self._keys[hotkey_id]
+        if ctypes.windll.user32.RegisterHotKey(None, hotkey_id + 1, modifiers, vk):
+            self._registered.add(hotkey_id)
+        else:
+            print(f"[ERROR] Could not register hotkey: {self._combos[hotkey_id]}")
+
+    def _unregister(self, hotkey_id):
+        if hotkey_id in self._registered:
+            ctypes.windll.user32.UnregisterHotKey(None, hotkey_id + 1)
+            self._registered.discard(hotkey_id)
+
+    def run(self):
+        user32 = ctypes.windll.user32
+        msg = wintypes.MSG()
+        # Make sure the thread has a message queue before anyone posts to it.
+        user32.PeekMessageW(ctypes.byref(msg), None, 0, 0, 0)
+        self._thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+        for hotkey_id, combo in enumerate(self._combos):
+            if combo not in self._on_demand:
+                self._register(hotkey_id)
+        self._ready.set()
+        while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+            if msg.message == self.WM_HOTKEY:
+                self._callbacks[msg.wParam - 1]()
+            elif msg.message == self.WM_ENABLE_HOTKEY:
+                self._register(msg.wParam)
+            elif msg.message == self.WM_DISABLE_HOTKEY:
+                self._unregister(msg.wParam)
+        for hotkey_id in list(self._registered):
+            self._unregister(hotkey_id)
+
+    def _post(self, message, wparam=0):
+        if self._ready.wait(timeout=1.0):
+            ctypes.windll.user32.PostThreadMessageW(self._thread_id, message, wparam, 0)
+
+    def set_enabled(self, combo, enabled):
+        message = self.WM_ENABLE_HOTKEY if enabled else self.WM_DISABLE_HOTKEY
+        self._post(message, self._combos.index(combo))
+
+    def stop(self):
+        self._post(self.WM_QUIT)
+        self.join(timeout=1.0)
+
+
+
 # =====================================================================
 # InputRecorderApp: Main application window.
 # Responsible for initializing the GUI, handling input recording/playback,
 # managing global hotkeys, and saving/loading macros.
 # =====================================================================
 class InputRecorderApp(QtWidgets.QMainWindow):
-    macro_loaded = pyqtSignal(list)
+    macro_loaded = pyqtSignal(object)
+    macro_load_failed = pyqtSignal(str)
+    macro_saved = pyqtSignal(object, int, object, str)
+    macro_save_failed = pyqtSignal(str)
 
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Input Macro Recorder")
         self.setGeometry(100, 100, 900, 600)
 
-        self.actions = []
+        self.actions = ActionBuffer()
         self.start_time = None
         self.recording = False
         self.playing = False
-        self.stop_playback = False
+        self.stop_playback = threading.Event()
         self.last_event_time = None
 
-        self.mouse_event_interval = 0.05
-        self.last_mouse_move_time = 0
+        self.flush_interval_ms = 16
+        self._event_queue = collections.deque()
+        self._flush_posted = False
+        self._last_mouse_xy = None
+        self.move_epsilon = 2
+        self.path_epsilon = 1.0
+
+        self._mctrl = mouse.Controller()
+        self._kctrl = keyboard.Controller()
+        self._compiled_playback = None
 
         self.hotkey_config = self.load_hotkeys()
         self.init_ui()
-        self.setup_listeners()
+        self.mouse_listener = None
+        self.keyboard_listener = None
+        self.hotkeys = None
         self.setup_hotkeys()
         self.macro_loaded.connect(self._populate_table)
+        self.macro_load_failed.connect(self._on_macro_load_failed)
+        self.macro_saved.connect(self._on_macro_saved)
+        self.macro_save_failed.connect(self._on_macro_save_failed)
+
+        self._flush_timer = QtCore.QTimer(self)
+        self._flush_timer.timeout.connect(self._flush_events)
 
 
     # init_ui(): Initializes the visual components of the GUI.
@@ -144,8 +567,9 @@ class InputRecorderApp(QtWidgets.QMainWindow):
         self.speed_entry.setFixedWidth(40)
         toolbar.addWidget(self.speed_entry)
 
-        self.table = QtWidgets.QTableWidget(0, 6)
-        self.table.setHorizontalHeaderLabels(["Type", "Action", "X", "Y", "Extra", "Delay"])
+        self.model = ActionModel(self.actions, self)
+        self.table = QtWidgets.QTableView()
+        self.table.setModel(self.model)
         self.table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
         layout.addWidget(self.table)
 
@@ -159,19 +583,32 @@ class InputRecorderApp(QtWidgets.QMainWindow):
 
     # setup_listeners(): Starts the pynput keyboard and mouse listeners.
     # These listeners operate in background threads to detect all input globally.
+    # They only run while recording; pynput listeners cannot be restarted,
+    # so each recording session gets fresh ones.
     def setup_listeners(self):
+        self.stop_listeners()
         self.mouse_listener = mouse.Listener(
             on_move=self.on_mouse_move,
             on_click=self.on_mouse_click,
             on_scroll=self.on_mouse_scroll
         )
         self.keyboard_listener = keyboard.Listener(
-            on_press=self.on_key_press,
-            on_release=self.on_key_release
+            on_press=self.on_key_press
         )
         self.mouse_listener.start()
         self.keyboard_listener.start()
 
+
+    # stop_listeners(): Stops the recording listeners, if any are running.
+    # Only the GlobalHotKeys listener stays alive between sessions.
+    def stop_listeners(self):
+        if self.mouse_listener is not None:
+            self.mouse_listener.stop()
+            self.mouse_listener = None
+        if self.keyboard_listener is not None:
+            self.keyboard_listener.stop()
+            self.keyboard_listener = None
+
     
 
     # open_settings(): Opens the hotkey settings dialog.
@@ -198,36 +635,95 @@ class InputRecorderApp(QtWidgets.QMainWindow):
 
 
     # setup_hotkeys(): Reads hotkeys from config and sets up global shortcuts.
-    # The GlobalHotKeys listener handles activation of Start, Stop, and Play.
+    # The hotkey listener handles activation of Start, Stop, and Play,
+    # plus Esc as an emergency stop. On Windows the hotkeys are registered
+    # natively, with Esc only held while recording or playing.
+    # Elsewhere GlobalHotKeys stays: an X11 XGrabKey version would need
+    # extra grabs per combo for every NumLock/CapsLock state, and a grab
+    # swallows the key, so Esc would need the same on-demand toggling.
     def setup_hotkeys(self):
-        hotkeys = GlobalHotKeys({
+        bindings = {
             '<ctrl>+<f1>': lambda: QtCore.QMetaObject.invokeMethod(self, "check_start_recording", QtCore.Qt.QueuedConnection),
             '<ctrl>+<f2>': lambda: QtCore.QMetaObject.invokeMethod(self, "stop_all", QtCore.Qt.QueuedConnection),
             '<ctrl>+<f3>': lambda: QtCore.QMetaObject.invokeMethod(self, "start_playing", QtCore.Qt.QueuedConnection),
-        })
-        hotkeys.start()
+            '<esc>': lambda: QtCore.QMetaObject.invokeMethod(self, "stop_all", QtCore.Qt.QueuedConnection),
+        }
+        if sys.platform == 'win32':
+            self.hotkeys = NativeHotKeys(bindings, on_demand=('<esc>',))
+        else:
+            self.hotkeys = GlobalHotKeys(bindings)
+        self.hotkeys.start()
+        self._update_escape_hotkey()
+
+
+    # _update_escape_hotkey(): Holds the native Esc hotkey only while a
+    # recording or playback is running. GlobalHotKeys does not swallow
+    # keys, so there Esc simply stays registered.
+    def _update_escape_hotkey(self):
+        if isinstance(self.hotkeys, NativeHotKeys):
+            self.hotkeys.set_enabled('<esc>', self.recording or self.playing)
 
     @QtCore.pyqtSlot()
     def stop_all(self):
         self.stop_recording()
         self.stop_playing()
 
-    def current_delay(self):
-        now = time.time()
-        delay = 0.0 if self.last_event_time is None else round(now - self.last_event_time, 3)
-        self.last_event_time = now
-        return delay
-
-
-    # log_event(): Records a single input event (keyboard/mouse) with timestamp.
-    # Adds it to both the event list and visual table.
-    def log_event(self, event, record_to_list=True):
-        if record_to_list:
-            self.actions.append(event)
-        row_pos = self.table.rowCount()
-        self.table.insertRow(row_pos)
-        for i, key in enumerate(["type", "action", "x", "y", "extra", "delay"]):
-            self.table.setItem(row_pos, i, QtWidgets.QTableWidgetItem(str(event.get(key, ''))))
+    # current_delay(): Milliseconds since the previous logged event.
+    # Timestamps come from the monotonic perf_counter_ns() clock.
+    def current_delay(self, now_ns):
+        last = self.last_event_time
+        delay_ms = 0 if last is None or now_ns < last else (now_ns - last) // 1_000_000
+        self.last_event_time = now_ns
+        return delay_ms
+
+
+    # _queue_event(): Called on the listener threads to hand an event over.
+    # The flush timer normally drains the queue; once it holds FLUSH_WATERMARK
+    # events a flush is also posted straight to the GUI thread's event loop.
+    FLUSH_WATERMARK = 32
+
+    def _queue_event(self, entry):
+        queue = self._event_queue
+        queue.append(entry)
+        if len(queue) >= self.FLUSH_WATERMARK and not self._flush_posted:
+            self._flush_posted = True
+            QtCore.QMetaObject.invokeMethod(self, "_flush_events", QtCore.Qt.QueuedConnection)
+
+
+    # _flush_events(): Drains events queued by the listener threads.
+    # Runs on the GUI thread, so delays are computed and the model is
+    # touched here only. Consecutive moves collapse to the latest position,
+    # moves less than move_epsilon pixels (on both axes) from where the
+    # cursor already is are dropped, and the whole batch is inserted with
+    # a single beginInsertRows.
+    @QtCore.pyqtSlot()
+    def _flush_events(self):
+        self._flush_posted = False
+        queue = self._event_queue
+        if not queue:
+            return
+        batch = []
+        last_was_move = False
+        for _ in range(len(queue)):
+            entry = queue.popleft()
+            is_move = entry[1] == T_MOUSE and entry[2] == A_MOVE
+            if is_move and last_was_move:
+                batch[-1] = entry
+            else:
+                batch.append(entry)
+            last_was_move = is_move
+        records = []
+        epsilon = self.move_epsilon
+        last_xy = self._last_mouse_xy
+        for timestamp, type_code, action, x, y, extra in batch:
+            if type_code == T_MOUSE:
+                if (action == A_MOVE and last_xy is not None
+                        and abs(x - last_xy[0]) < epsilon and abs(y - last_xy[1]) < epsilon):
+                    continue
+                last_xy = (x, y)
+            records.append((type_code, action, x, y, extra, self.current_delay(timestamp)))
+        self._last_mouse_xy = last_xy
+        self.model.extend_actions(records)
 
     @QtCore.pyqtSlot()
     def check_start_recording(self):
@@ -253,136 +749,280 @@ class InputRecorderApp(QtWidgets.QMainWindow):
     # start_recording(): Begins recording of input events.
     # Initializes state, clears prior events, and prepares capture.
     def start_recording(self):
-        self.actions.clear()
-        self.table.setRowCount(0)
+        self.actions = ActionBuffer()
+        self.model.set_actions(self.actions)
         self.recording = True
-        self.start_time = time.time()
+        self.start_time = time.perf_counter_ns()
         self.last_event_time = None
+        self._event_queue.clear()
+        self._last_mouse_xy = None
+        self.setup_listeners()
+        self._flush_timer.start(self.flush_interval_ms)
+        self._update_escape_hotkey()
         print("[REC] Recording started")
 
 
     # stop_recording(): Halts the current recording session.
-    # Unregisters listeners and updates UI state.
+    # Unregisters listeners and updates UI state. Recording is switched off
+    # first so no callback queues an event after the final flush.
     def stop_recording(self):
         self.recording = False
+        self.stop_listeners()
+        self._flush_events()
+        self._flush_timer.stop()
+        self._update_escape_hotkey()
         print("[REC] Recording stopped")
 
     @QtCore.pyqtSlot()
     def start_playing(self):
+        if self.playing:
+            return
         if not self.actions:
             QtWidgets.QMessageBox.warning(self, "No macro", "No actions to play.")
             return
+        self.stop_playback.set()
         self.playing = True
-        self.stop_playback = False
-        threading.Thread(target=self.play_macro, daemon=True).start()
+        self.stop_playback = threading.Event()
+        self._update_escape_hotkey()
+        threading.Thread(target=self.play_macro, args=(self.stop_playback,), daemon=True).start()
 
     def stop_playing(self):
-        self.stop_playback = True
+        self.stop_playback.set()
         self.playing = False
+        self._update_escape_hotkey()
 
 
     # play_macro(): Replays the recorded input actions in sequence.
     # Includes logic for timing delays, scaling, and repeat cycles.
-    def play_macro(self):
-        mctrl = mouse.Controller()
-        kctrl = keyboard.Controller()
+    # Each run gets its own stop Event; delays wait on it, so stopping
+    # interrupts even a long delay immediately. All setup runs inside the
+    # try so playing is always reset; a non-positive speed plays at 1.0.
+    SPIN_SECONDS = 0.002
+    PRECOMPILE_SECONDS = 0.25
+
+    def play_macro(self, stopped):
+        if sys.platform == 'win32':
+            ctypes.windll.winmm.timeBeginPeriod(1)
         try:
-            repeat_count = max(1, int(self.repeat_entry.text()))
-            speed = float(self.speed_entry.text())
-        except ValueError:
-            repeat_count = 1
-            speed = 1.0
-
-        for _ in range(repeat_count):
-            for action in self.actions:
-                if self.stop_playback:
+            mctrl = self._mctrl
+            press = self._kctrl.press
+            release = self._kctrl.release
+            try:
+                repeat_count = max(1, int(self.repeat_entry.text()))
+                speed = float(self.speed_entry.text())
+            except ValueError:
+                repeat_count = 1
+                speed = 1.0
+            if not speed > 0:
+                speed = 1.0
+
+            actions = self.actions
+            vocab = actions.vocab
+            keys = [KEY_LOOKUP.get(name, name) for name in vocab]
+
+            def tap(index):
+                try:
+                    press(keys[index])
+                    release(keys[index])
+                except Exception as e:
+                    print(f"[ERROR] Could not playback key: {vocab[index]}, {e}")
+
+            # Delays are scheduled against an absolute deadline so the OS rounding
+            # of each sleep does not accumulate; the last SPIN_SECONDS are spun.
+            # wait() returns True once playback has been stopped.
+            # Blocks are compiled before the schedule starts for up to
+            # PRECOMPILE_SECONDS (always at least block 0); the rest are compiled
+            # ahead during delays long enough to absorb them.
+            scale = 0.001 / speed
+            perf_counter = time.perf_counter
+            blocks = self._playback_blocks(actions)
+
+            def prepare(index):
+                if blocks[index] is not None:
+                    return 0.0
+                started = perf_counter()
+                self._compile_block(actions, blocks, index)
+                return perf_counter() - started
+
+            compile_cost = 0.0
+            pending = 0
+            budget_end = perf_counter() + self.PRECOMPILE_SECONDS
+            while pending < len(blocks) and (pending == 0 or perf_counter() < budget_end):
+                if stopped.is_set():
+                    return
+                compile_cost = prepare(pending) or compile_cost
+                pending += 1
+            deadline = perf_counter()
+
+            def wait(delay_ms):
+                nonlocal deadline, pending, compile_cost
+                deadline += delay_ms * scale
+                while (pending < len(blocks) and not stopped.is_set()
+                       and deadline - perf_counter() > self.SPIN_SECONDS + 2 * compile_cost):
+                    compile_cost = prepare(pending) or compile_cost
+                    pending += 1
+                remaining = deadline - perf_counter()
+                if remaining > self.SPIN_SECONDS and stopped.wait(remaining - self.SPIN_SECONDS):
+                    return True
+                while perf_counter() < deadline:
+                    pass
+                return stopped.is_set()
+
+            setpos = type(mctrl).position.fset
+            for _ in range(repeat_count):
+                for index in range(len(blocks)):
+                    if stopped.is_set():
+                        break
+                    # A block that could not be compiled ahead stalls playback;
+                    # shift the schedule so the next events are not burst out.
+                    deadline += prepare(index)
+                    pending = max(pending, index + 1)
+                    if blocks[index](mctrl, setpos, mctrl.click, mctrl.scroll, tap, wait, stopped.is_set):
+                        break
+                if stopped.is_set():
                     break
-                time.sleep(action['delay'] / speed)
-                if action['type'] == 'Mouse':
-                    if action['action'] == 'Move':
-                        mctrl.position = (action['x'], action['y'])
-                    elif action['action'] == 'Click':
-                        mctrl.position = (action['x'], action['y'])
-                        mctrl.click(mouse.Button.left if action['extra'] == 'left' else mouse.Button.right)
-                    elif action['action'] == 'Scroll':
-                        mctrl.position = (action['x'], action['y'])
-                        mctrl.scroll(0, action['extra'])
-                elif action['type'] == 'Key':
-                    try:
-                        key_lookup = f"Key.{action['action']}" if action.get('is_special') else action['action']
-                        key = key_mapping.get(key_lookup, action['action'])
-                        kctrl.press(key)
-                        kctrl.release(key)
-                    except Exception as e:
-                        print(f"[ERROR] Could not playback key: {action['action']}, {e}")
-            if self.stop_playback:
-                break
-        self.playing = False
-
-
-    # save_macro(): Saves the current list of events to a JSON file.
-    # Prompts for overwrite if file exists.
+        finally:
+            if sys.platform == 'win32':
+                ctypes.windll.winmm.timeEndPeriod(1)
+            if self.stop_playback is stopped:
+                self.playing = False
+                self._update_escape_hotkey()
+
+
+    # _playback_blocks(): Returns the macro's compiled playback blocks.
+    # The macro is split into BLOCK_ACTIONS-sized blocks, each compiled on
+    # demand by _compile_block(), so playback starts after compiling only
+    # the first block, a stop lands between blocks, and no single huge
+    # function is ever built. Unused slots hold None.
+    # The list is cached until the buffer is replaced or grows, so replaying
+    # the same macro again skips code generation entirely.
+    BLOCK_ACTIONS = 2000
+
+    def _playback_blocks(self, actions):
+        cached = self._compiled_playback
+        if cached is not None and cached[0] is actions and cached[1] == len(actions):
+            return cached[2]
+        blocks = [None] * -(-len(actions) // self.BLOCK_ACTIONS)
+        self._compiled_playback = (actions, len(actions), blocks)
+        return blocks
+
+
+    # _compile_block(): Generates one straight-line function for a block.
+    # Every action becomes a direct call with its values as literals, so
+    # playback does no per-event dispatch. The cursor is only repositioned
+    # when an event's coordinates differ from the previous mouse event's
+    # (e.g. a Click right after a Move). Every wait() doubles as a stop
+    # check, and runs of STOP_CHECK_ACTIONS actions without a delay get
+    # an explicit one. The function returns True if playback was stopped.
+    STOP_CHECK_ACTIONS = 100
+
+    def _compile_block(self, actions, blocks, index):
+        vocab = actions.vocab
+        start = index * self.BLOCK_ACTIONS
+        lines = ["def _play(m, setpos, click, scroll, tap, wait, stop):"]
+        since_check = 0
+        last_pos = None
+        for type_code, action, x, y, extra, delay_ms in zip(*actions.to_lists(start, start + self.BLOCK_ACTIONS)):
+            if delay_ms:
+                lines.append(f"    if wait({delay_ms}): return True")
+                since_check = 0
+            elif since_check >= self.STOP_CHECK_ACTIONS:
+                lines.append("    if stop(): return True")
+                since_check = 0
+            since_check += 1
+            if type_code == T_KEY:
+                lines.append(f"    tap({action})")
+                continue
+            if (x, y) != last_pos:
+                lines.append(f"    setpos(m, ({x}, {y}))")
+                last_pos = (x, y)
+            if action == A_CLICK:
+                button = "LEFT" if vocab[extra] == 'left' else "RIGHT"
+                lines.append(f"    click({button})")
+            elif action == A_SCROLL:
+                lines.append(f"    scroll(0, {extra})")
+        lines.append("    return False")
+
+        namespace = {'LEFT': mouse.Button.left, 'RIGHT': mouse.Button.right}
+        exec(compile("\n".join(lines), f"<macro:{index}>", "exec"), namespace)
+        blocks[index] = namespace['_play']
+        return blocks[index]
+
+
+    # save_macro(): Saves the current events to a compressed .npz file.
+    # Choosing a .json name exports the legacy list-of-dicts format instead.
+    # Mouse paths are simplified first, which also shortens the table.
+    # Simplifying and writing happen in a worker thread, like load_macro().
     def save_macro(self):
-        file, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Save Macro", "", "JSON Files (*.json)")
+        file, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Save Macro", "", "Macro Files (*.npz);;JSON Files (*.json)")
         if file:
-            with open(file, "w") as f:
-                json.dump(self.actions, f, indent=2)
+            actions = self.actions
+            count = len(actions)
+            epsilon = self.path_epsilon
+
+            def save_worker():
+                try:
+                    simplified = actions.simplified(epsilon)
+                    if file.lower().endswith(".json"):
+                        write_json(file, simplified.to_events())
+                    else:
+                        simplified.save_npz(file)
+                    self.macro_saved.emit(actions, count, simplified, file)
+                except Exception as e:
+                    self.macro_save_failed.emit(str(e))
+
+            threading.Thread(target=save_worker, daemon=True).start()
+
+
+    # _on_macro_saved(): Shows the simplified events once the save finishes,
+    # unless the table has been replaced or grown in the meantime.
+    def _on_macro_saved(self, original, count, simplified, file):
+        if self.actions is original and len(original) == count:
+            self._populate_table(simplified)
+        self.statusBar().showMessage(f"Saved {file}", 5000)
 
+    def _on_macro_save_failed(self, error):
+        QtWidgets.QMessageBox.critical(self, "Error", f"Failed to save macro:\n{error}")
 
-    # load_macro(): Opens a JSON macro file and populates the GUI table.
-    # Validates structure and prevents re-logging imported events.
+
+    # load_macro(): Opens a .npz or JSON macro file and populates the GUI table.
+    # The ActionBuffer is built in the worker thread, off the GUI thread.
     def load_macro(self):
-        file, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Load Macro", "", "JSON Files (*.json)")
+        file, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Load Macro", "", "Macro Files (*.npz *.json)")
         if file:
             def load_worker():
                 try:
-                    with open(file, "r") as f:
-                        loaded_actions = json.load(f)
+                    if file.lower().endswith(".npz"):
+                        loaded_actions = ActionBuffer.load_npz(file)
+                    else:
+                        loaded_actions = ActionBuffer.load_json(file)
                     self.macro_loaded.emit(loaded_actions)
                 except Exception as e:
-                    QtWidgets.QMessageBox.critical(self, "Error", f"Failed to load macro:\n{e}")
+                    self.macro_load_failed.emit(str(e))
 
             threading.Thread(target=load_worker, daemon=True).start()
 
+    def _on_macro_load_failed(self, error):
+        QtWidgets.QMessageBox.critical(self, "Error", f"Failed to load macro:\n{error}")
+
 
     # _populate_table(self):
-    # Populates the table widget from self.events list.
-    # Ensures each row shows action type, key/button, coordinates, and delay.
+    # Swaps the loaded events into the model in a single reset.
+    # The view then only reads the rows that are actually visible.
     def _populate_table(self, loaded_actions):
         self.actions = loaded_actions
-        self.table.setRowCount(0)
-        self._load_index = 0
-
-        def load_chunk():
-            CHUNK_SIZE = 20
-            for _ in range(CHUNK_SIZE):
-                if self._load_index >= len(self.actions):
-                    self._load_timer.stop()
-                    return
-                self.log_event(self.actions[self._load_index], record_to_list=False)
-                self._load_index += 1
-
-        self._load_timer = QtCore.QTimer()
-        self._load_timer.timeout.connect(load_chunk)
-        self._load_timer.start(10)
+        self.model.set_actions(self.actions)
 
 
     # on_mouse_move(self, x, y):
     # Triggered by the mouse listener on cursor movement.
-    # Logs mouse movement with current coordinates and delay.
+    # Queues the position; _flush_events() keeps only the latest one per tick.
     def on_mouse_move(self, x, y):
         if self.playing or not self.recording:
             return
-        now = time.time()
-        if now - self.last_mouse_move_time >= self.mouse_event_interval:
-            self.last_mouse_move_time = now
-            self.log_event({
-                'type': 'Mouse',
-                'action': 'Move',
-                'x': x,
-                'y': y,
-                'delay': self.current_delay()
-            })
+        self._queue_event((time.perf_counter_ns(), T_MOUSE, A_MOVE, x, y, 0))
 
 
     # on_mouse_click(self, x, y, button, pressed):
@@ -391,14 +1031,7 @@ class InputRecorderApp(QtWidgets.QMainWindow):
     def on_mouse_click(self, x, y, button, pressed):
         if self.playing or not self.recording or not pressed:
             return
-        self.log_event({
-            'type': 'Mouse',
-            'action': 'Click',
-            'x': x,
-            'y': y,
-            'extra': button.name,
-            'delay': self.current_delay()
-        })
+        self._queue_event((time.perf_counter_ns(), T_MOUSE, A_CLICK, x, y, button.name))
 
 
     # on_mouse_scroll(self, x, y, dx, dy):
@@ -407,44 +1040,26 @@ class InputRecorderApp(QtWidgets.QMainWindow):
     def on_mouse_scroll(self, x, y, dx, dy):
         if self.playing or not self.recording:
             return
-        self.log_event({
-            'type': 'Mouse',
-            'action': 'Scroll',
-            'x': x,
-            'y': y,
-            'extra': dy,
-            'delay': self.current_delay()
-        })
+        self._queue_event((time.perf_counter_ns(), T_MOUSE, A_SCROLL, x, y, dy))
 
 
     # on_key_press(self, key):
     # Captures a key press event and logs it.
-    # Also tracks modifier keys like Ctrl, Shift.
+    # Also tracks modifier keys like Ctrl, Shift. KeyCodes without a
+    # character (bare virtual keys) have no name to replay and are skipped.
     def on_key_press(self, key):
         if self.playing or not self.recording:
             return
-        try:
-            if hasattr(key, 'char') and key.char is not None:
-                name = key.char
-                is_special = False
-            else:
-                name = key.name
-                is_special = True
-            self.log_event({
-                'type': 'Key',
-                'action': name,
-                'is_special': is_special,
-                'delay': self.current_delay()
-            })
-        except Exception as e:
-            print(f"[ERROR] on_key_press: {e}")
-
-
-    # on_key_release(self, key):
-    # Captures key release. Used to manage modifiers and debounce behavior.
-    def on_key_release(self, key):
-        if key == keyboard.Key.esc:
-            self.stop_all()
+        if isinstance(key, _KeyCode):
+            name = key.char
+            if name is None:
+                return
+            is_special = False
+        else:
+            name = key.name
+            is_special = True
+        self._queue_event((time.perf_counter_ns(), T_KEY, name, 0, 0, is_special))
+
 
 if __name__ == '__main__':
     app = QtWidgets.QApplication(sys.argv)